@@ -9,13 +9,20 @@ Email Validator Script
 4. Ограничивает запросы к DNS (по умолчанию 50 в секунду)
 """
 
+import functools
 import re
+import string
 import sys
 import sqlite3
 import argparse
+import asyncio
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import dns.resolver
+import dns.asyncresolver
 import dns.exception
+from collections import deque
 from datetime import datetime
 from typing import List, Dict, Optional
 from dataclasses import dataclass
@@ -49,110 +56,239 @@ class RateLimiter:
     
     def __init__(self, max_per_second: int = 50):
         self.max_per_second = max_per_second
-        self.requests = []
+        self.requests = deque()
+        # Защищает окно при вызовах wait из пула потоков
+        self._lock = threading.Lock()
+
+    def _evict_old(self, current_time: float):
+        """Удаляет из окна записи старше 1 секунды (O(1) на запись амортизированно)"""
+        requests = self.requests
+        while requests and current_time - requests[0] >= 1.0:
+            requests.popleft()
     
     def wait(self):
         """Ожидает, если необходимо, чтобы не превысить лимит"""
         if self.max_per_second <= 0:
             return  # Без ограничений
-            
+
+        with self._lock:
+            current_time = time.time()
+
+            # Удаляем записи старше 1 секунды
+            self._evict_old(current_time)
+
+            # Если достигли лимита, ждем
+            if len(self.requests) >= self.max_per_second:
+                sleep_time = 1.0 - (current_time - self.requests[0])
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                    # Обновляем окно после ожидания
+                    current_time = time.time()
+                    self._evict_old(current_time)
+
+            # Добавляем текущий запрос
+            self.requests.append(current_time)
+
+    async def wait_async(self):
+        """Асинхронный вариант wait: ждет через asyncio.sleep, не блокируя цикл событий"""
+        if self.max_per_second <= 0:
+            return  # Без ограничений
+
         current_time = time.time()
-        
+
         # Удаляем записи старше 1 секунды
-        self.requests = [t for t in self.requests if current_time - t < 1.0]
-        
-        # Если достигли лимита, ждем
-        if len(self.requests) >= self.max_per_second:
+        self._evict_old(current_time)
+
+        # Пока лимит исчерпан, ждем и перепроверяем окно после каждого
+        # пробуждения: одновременно проснувшиеся корутины иначе займут
+        # один и тот же освободившийся слот
+        while len(self.requests) >= self.max_per_second:
             sleep_time = 1.0 - (current_time - self.requests[0])
             if sleep_time > 0:
-                time.sleep(sleep_time)
-                # Обновляем список после ожидания
-                current_time = time.time()
-                self.requests = [t for t in self.requests if current_time - t < 1.0]
-        
+                await asyncio.sleep(sleep_time)
+            # Обновляем окно после ожидания
+            current_time = time.time()
+            self._evict_old(current_time)
+
         # Добавляем текущий запрос
         self.requests.append(current_time)
-    
+
     def get_current_rate(self) -> float:
         """Возвращает текущую скорость запросов"""
-        current_time = time.time()
-        self.requests = [t for t in self.requests if current_time - t < 1.0]
-        return len(self.requests)
+        with self._lock:
+            self._evict_old(time.time())
+            return len(self.requests)
+
+
+# Допустимые символы части домена: ASCII буквы/цифры и дефис.
+# Проверка через frozenset выполняется C-циклом без движка регулярок
+_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + '-')
+
+
+@functools.lru_cache(maxsize=10000)
+def _is_valid_domain_syntax(domain: str) -> bool:
+    """
+    Проверяет синтаксис домена
+
+    Чистая детерминированная функция, вынесена на уровень модуля ради
+    lru_cache: повторные домены из одной пачки не разбираются заново.
+    """
+    # Проверка длины
+    if len(domain) > 253:
+        return False
+
+    # Двойной дефис не пересекает точку, поэтому проверяем его одним
+    # сканированием всего домена вместо проверки в каждой части
+    if '--' in domain:
+        return False
+
+    # Проверка частей домена
+    parts = domain.split('.')
+    if len(parts) < 2:
+        return False
+
+    for part in parts:
+        # Проверка длины части
+        if len(part) == 0 or len(part) > 63:
+            return False
+
+        # Дефисы по краям
+        if part[0] == '-' or part[-1] == '-':
+            return False
+
+        # Проверка символов: set.issuperset по строке — C-цикл
+        if not _DOMAIN_CHARS.issuperset(part):
+            return False
+
+    return True
 
 
 class EmailValidator:
     """Класс для проверки email адресов"""
     
-    # Регулярное выражение для проверки синтаксиса email
+    # Регулярное выражение для проверки синтаксиса email: за один проход
+    # проверяет локальную часть и структуру домена (минимум два уровня,
+    # метки 1-63 символа, без дефисов по краям) и извлекает домен
     EMAIL_REGEX = re.compile(
-        r"^[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*$"
+        r"^(?P<local>[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+)@"
+        r"(?P<domain>(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+"
+        r"[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)$"
     )
-    
-    def __init__(self, rate_limit: int = 50):
+
+    # Публичные DNS серверы: один медленный upstream не сериализует
+    # весь конвейер, запросы распределяются между серверами
+    NAMESERVERS = ['1.1.1.1', '8.8.8.8', '9.9.9.9']
+
+    # Максимальный TTL кеша MX записей (секунды)
+    MX_CACHE_TTL = 900
+    # TTL для негативных результатов (NXDOMAIN, отсутствие MX)
+    MX_NEGATIVE_TTL = 60
+
+    def __init__(self, rate_limit: int = 50, db_manager: 'DatabaseManager' = None):
         """
         Инициализация валидатора
         
         Args:
             rate_limit: Максимальное число DNS запросов в секунду
+            db_manager: Менеджер БД для персистентного DNS кеша (опционально)
         """
         self.resolver = dns.resolver.Resolver()
-        self.resolver.timeout = 5
-        self.resolver.lifetime = 5
+        self.aresolver = dns.asyncresolver.Resolver()
+        for resolver in (self.resolver, self.aresolver):
+            # Несколько резолверов с ротацией и быстрым переключением:
+            # таймаут на сервер 2с, на запрос целиком 4с
+            resolver.nameservers = list(self.NAMESERVERS)
+            resolver.rotate = True
+            resolver.timeout = 2
+            resolver.lifetime = 4
+            # Отключаем подстановку суффиксов из системного search-списка:
+            # иначе каждый промах порождает дополнительные запросы
+            resolver.search = []
+            resolver.use_search_by_default = False
+            # Внутренний кеш dnspython: дополняет кеш MX уровнем ниже,
+            # например для повторных A запросов
+            resolver.cache = dns.resolver.LRUCache(10000)
         self.rate_limiter = RateLimiter(max_per_second=rate_limit)
         self.rate_limit = rate_limit
+        # Кеш результатов MX запросов: домен -> (записи или исключение, срок годности)
+        self._mx_cache: Dict[str, tuple] = {}
+        # Запросы в полете: домен -> Future, чтобы параллельные проверки
+        # одного домена не дублировали DNS запрос до заполнения кеша
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Персистентный DNS кеш между запусками (если подключена БД)
+        self.db_manager = db_manager
     
-    def check_email(self, email: str) -> EmailResult:
+    def _parse_email(self, email: str):
         """
-        Проверяет один email адрес
-        
+        Синтаксическая часть проверки email (без DNS)
+
         Args:
-            email: Email адрес для проверки
-            
+            email: Email адрес (уже без пробельных символов по краям)
+
         Returns:
-            EmailResult с результатом проверки
+            Кортеж (результат, домен): при синтаксической ошибке заполнен
+            результат, а домен равен None; иначе наоборот.
         """
-        email = email.strip()
-        
         # 1. Проверка на пустую строку
         if not email:
-            return EmailResult(email, EmailStatus.NO_DOMAIN, error="Пустая строка")
-        
-        # 2. Проверка синтаксиса email
-        if not self._is_valid_syntax(email):
-            return EmailResult(email, EmailStatus.NO_DOMAIN, 
-                             error="Некорректный синтаксис email")
-        
-        # 3. Извлечение домена
-        try:
-            domain = email.split('@')[1]
-        except IndexError:
+            return EmailResult(email, EmailStatus.NO_DOMAIN, error="Пустая строка"), None
+
+        # 2. Дешевый предфильтр до регулярного выражения: поиск @ — это
+        # memchr на уровне C, а RFC 5321 ограничивает адрес 254 символами.
+        # Мусорные строки отсеиваются, не доходя до движка регулярок
+        if '@' not in email:
             return EmailResult(email, EmailStatus.NO_DOMAIN,
-                             error="Отсутствует символ @ или домен")
-        
-        # 4. Проверка синтаксиса домена
+                             error="Отсутствует символ @ или домен"), None
+        if len(email) > 254 or len(email) < 3:
+            return EmailResult(email, EmailStatus.NO_DOMAIN,
+                             error="Некорректный синтаксис email"), None
+
+        # 3. Синтаксис email и домена одним проходом регулярного выражения;
+        # домен извлекается из именованной группы вместо повторного split
+        match = self.EMAIL_REGEX.match(email)
+        if match is None:
+            return EmailResult(email, EmailStatus.NO_DOMAIN,
+                             error="Некорректный синтаксис email"), None
+
+        domain = match.group('domain')
+
+        # 4. Остаточные проверки домена, не выраженные в общем шаблоне
+        # (общая длина, запрет двойного дефиса), через кешируемый
+        # валидатор: повторные домены из пачки не разбираются заново
         if not self._is_valid_domain_syntax(domain):
             return EmailResult(email, EmailStatus.NO_DOMAIN,
-                             error="Некорректный синтаксис домена")
-        
-        # 5. Проверка MX записей с ограничением скорости
+                             error="Некорректный синтаксис домена"), None
+
+        # 5. Нормализуем домен один раз при извлечении: DNS регистронезависим,
+        # и без нормализации Gmail.com и gmail.com не делят кеш и группировку.
+        # IDNA кодирование приводит юникодные домены к ASCII форме
+        try:
+            domain = domain.lower().encode('idna').decode('ascii')
+        except UnicodeError:
+            return EmailResult(email, EmailStatus.NO_DOMAIN,
+                             error="Некорректный синтаксис домена"), None
+
+        return None, domain
+
+    def _check_domain(self, domain: str):
+        """
+        DNS часть проверки: MX записи домена (с ограничением скорости)
+
+        Returns:
+            Кортеж (статус, MX записи, текст ошибки или None)
+        """
         try:
-            # Применяем ограничение скорости перед DNS запросом
-            self.rate_limiter.wait()
             mx_records = self._check_mx_records(domain)
             if mx_records:
-                return EmailResult(email, EmailStatus.VALID_DOMAIN, mx_records=mx_records)
+                return EmailStatus.VALID_DOMAIN, mx_records, None
             else:
-                return EmailResult(email, EmailStatus.NO_MX,
-                                 error="MX записи не найдены")
+                return EmailStatus.NO_MX, [], "MX записи не найдены"
         except dns.resolver.NXDOMAIN:
-            return EmailResult(email, EmailStatus.NO_DOMAIN,
-                             error="Домен не существует (NXDOMAIN)")
+            return EmailStatus.NO_DOMAIN, [], "Домен не существует (NXDOMAIN)"
         except dns.resolver.NoNameservers:
-            return EmailResult(email, EmailStatus.DNS_ERROR,
-                             error="Нет доступных DNS серверов")
+            return EmailStatus.DNS_ERROR, [], "Нет доступных DNS серверов"
         except dns.exception.Timeout:
-            return EmailResult(email, EmailStatus.DNS_ERROR,
-                             error="Таймаут DNS запроса")
+            return EmailStatus.DNS_ERROR, [], "Таймаут DNS запроса"
         except dns.resolver.NoAnswer:
             # Нет MX записей, проверяем есть ли домен (A запись)
             try:
@@ -160,58 +296,230 @@ class EmailValidator:
                 self.rate_limiter.wait()
                 # Проверяем A запись
                 self.resolver.resolve(domain, 'A')
-                return EmailResult(email, EmailStatus.NO_MX,
-                                 error="Есть A запись, но нет MX записей")
+                return EmailStatus.NO_MX, [], "Есть A запись, но нет MX записей"
             except dns.resolver.NXDOMAIN:
-                return EmailResult(email, EmailStatus.NO_DOMAIN,
-                                 error="Домен не существует")
+                return EmailStatus.NO_DOMAIN, [], "Домен не существует"
             except Exception as e:
-                return EmailResult(email, EmailStatus.UNKNOWN,
-                                 error=f"Ошибка при проверке A записи: {str(e)}")
+                return EmailStatus.UNKNOWN, [], f"Ошибка при проверке A записи: {str(e)}"
         except Exception as e:
-            return EmailResult(email, EmailStatus.UNKNOWN,
-                             error=f"Неизвестная ошибка: {str(e)}")
-    
-    def _is_valid_syntax(self, email: str) -> bool:
-        """Проверяет синтаксис email адреса"""
-        return bool(self.EMAIL_REGEX.match(email))
-    
+            return EmailStatus.UNKNOWN, [], f"Неизвестная ошибка: {str(e)}"
+
+    async def _check_domain_async(self, domain: str):
+        """Асинхронный вариант _check_domain"""
+        try:
+            mx_records = await self._check_mx_records_async(domain)
+            if mx_records:
+                return EmailStatus.VALID_DOMAIN, mx_records, None
+            else:
+                return EmailStatus.NO_MX, [], "MX записи не найдены"
+        except dns.resolver.NXDOMAIN:
+            return EmailStatus.NO_DOMAIN, [], "Домен не существует (NXDOMAIN)"
+        except dns.resolver.NoNameservers:
+            return EmailStatus.DNS_ERROR, [], "Нет доступных DNS серверов"
+        except dns.exception.Timeout:
+            return EmailStatus.DNS_ERROR, [], "Таймаут DNS запроса"
+        except dns.resolver.NoAnswer:
+            # Нет MX записей, проверяем есть ли домен (A запись)
+            try:
+                # Применяем ограничение скорости перед вторым DNS запросом
+                await self.rate_limiter.wait_async()
+                # Проверяем A запись
+                await self.aresolver.resolve(domain, 'A')
+                return EmailStatus.NO_MX, [], "Есть A запись, но нет MX записей"
+            except dns.resolver.NXDOMAIN:
+                return EmailStatus.NO_DOMAIN, [], "Домен не существует"
+            except Exception as e:
+                return EmailStatus.UNKNOWN, [], f"Ошибка при проверке A записи: {str(e)}"
+        except Exception as e:
+            return EmailStatus.UNKNOWN, [], f"Неизвестная ошибка: {str(e)}"
+
+    def check_email(self, email: str) -> EmailResult:
+        """
+        Проверяет один email адрес
+
+        Args:
+            email: Email адрес для проверки
+
+        Returns:
+            EmailResult с результатом проверки
+        """
+        email = email.strip()
+
+        result, domain = self._parse_email(email)
+        if result is not None:
+            return result
+
+        status, mx_records, error = self._check_domain(domain)
+        return EmailResult(email, status, mx_records=mx_records, error=error)
+
+    async def check_email_async(self, email: str) -> EmailResult:
+        """
+        Асинхронно проверяет один email адрес
+
+        Повторяет логику check_email, но DNS запросы выполняются через
+        dns.asyncresolver и не блокируют цикл событий, что позволяет
+        проверять много адресов параллельно.
+
+        Args:
+            email: Email адрес для проверки
+
+        Returns:
+            EmailResult с результатом проверки
+        """
+        email = email.strip()
+
+        result, domain = self._parse_email(email)
+        if result is not None:
+            return result
+
+        status, mx_records, error = await self._check_domain_async(domain)
+        return EmailResult(email, status, mx_records=mx_records, error=error)
+
     def _is_valid_domain_syntax(self, domain: str) -> bool:
-        """Проверяет синтаксис домена"""
-        # Проверка длины
-        if len(domain) > 253:
-            return False
-        
-        # Проверка частей домена
-        parts = domain.split('.')
-        if len(parts) < 2:
-            return False
-        
-        for part in parts:
-            # Проверка длины части
-            if len(part) == 0 or len(part) > 63:
-                return False
-            
-            # Проверка символов
-            if not re.match(r"^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$", part):
-                return False
-            
-            # Проверка на двойной дефис
-            if '--' in part:
-                return False
-        
-        return True
+        """Проверяет синтаксис домена (результат кешируется по домену)"""
+        return _is_valid_domain_syntax(domain)
     
+    def _mx_cache_get(self, domain: str) -> Optional[List[str]]:
+        """
+        Возвращает закешированный результат MX запроса или None при промахе
+
+        Закешированные негативные результаты (например NXDOMAIN)
+        поднимаются повторно как исключения.
+        """
+        cached = self._mx_cache.get(domain)
+        if cached is None:
+            return None
+
+        value, expires_at = cached
+        if time.monotonic() >= expires_at:
+            del self._mx_cache[domain]
+            return None
+
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def _mx_cache_put(self, domain: str, value, ttl: float):
+        """Сохраняет результат (или исключение) MX запроса в кеш"""
+        self._mx_cache[domain] = (value, time.monotonic() + ttl)
+
+    def _persistent_cache_get(self, domain: str) -> Optional[List[str]]:
+        """
+        Читает результат из персистентного кеша в БД (если она подключена)
+
+        При попадании запись переносится и в память, чтобы не ходить
+        в SQLite повторно. Негативные результаты поднимаются как NXDOMAIN.
+        """
+        if self.db_manager is None:
+            return None
+
+        cached = self.db_manager.get_cached(domain)
+        if cached is None:
+            return None
+
+        mx_records, negative, ttl_left = cached
+        if negative:
+            e = dns.resolver.NXDOMAIN()
+            self._mx_cache_put(domain, e, min(ttl_left, self.MX_NEGATIVE_TTL))
+            raise e
+
+        self._mx_cache_put(domain, mx_records, min(ttl_left, self.MX_CACHE_TTL))
+        return mx_records
+
+    def _persistent_cache_put(self, domain: str, value, ttl: float):
+        """Сохраняет результат (или исключение) в персистентный кеш БД"""
+        if self.db_manager is None:
+            return
+        if isinstance(value, Exception):
+            self.db_manager.put_cached(domain, [], True, ttl)
+        else:
+            self.db_manager.put_cached(domain, value, False, ttl)
+
     def _check_mx_records(self, domain: str) -> List[str]:
-        """Проверяет MX записи для домена"""
+        """Проверяет MX записи для домена (с кешированием по домену)"""
+        cached = self._mx_cache_get(domain)
+        if cached is not None:
+            return cached
+
+        cached = self._persistent_cache_get(domain)
+        if cached is not None:
+            return cached
+
+        # Лимит скорости расходуем только на реальные DNS запросы
+        self.rate_limiter.wait()
         try:
             answers = self.resolver.resolve(domain, 'MX')
-            mx_records = []
-            for rdata in answers:
-                mx_records.append(str(rdata.exchange).rstrip('.'))
-            return mx_records
         except dns.resolver.NoAnswer:
+            self._mx_cache_put(domain, [], self.MX_NEGATIVE_TTL)
+            self._persistent_cache_put(domain, [], self.MX_NEGATIVE_TTL)
             return []
+        except dns.resolver.NXDOMAIN as e:
+            self._mx_cache_put(domain, e, self.MX_NEGATIVE_TTL)
+            self._persistent_cache_put(domain, e, self.MX_NEGATIVE_TTL)
+            raise
+
+        mx_records = []
+        for rdata in answers:
+            mx_records.append(str(rdata.exchange).rstrip('.'))
+
+        # TTL кеша не превышает TTL самой записи
+        ttl = min(answers.rrset.ttl, self.MX_CACHE_TTL)
+        self._mx_cache_put(domain, mx_records, ttl)
+        self._persistent_cache_put(domain, mx_records, ttl)
+        return mx_records
+
+    async def _check_mx_records_async(self, domain: str) -> List[str]:
+        """Асинхронно проверяет MX записи для домена (с кешированием по домену)"""
+        cached = self._mx_cache_get(domain)
+        if cached is not None:
+            return cached
+
+        cached = self._persistent_cache_get(domain)
+        if cached is not None:
+            return cached
+
+        # Запрос по этому домену уже выполняется — ждем его результат,
+        # не отправляя дублирующий DNS запрос
+        inflight = self._inflight.get(domain)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        # Гасим предупреждение "exception was never retrieved",
+        # если к моменту ошибки никто не успел подписаться на Future
+        future.add_done_callback(lambda f: f.exception())
+        self._inflight[domain] = future
+
+        try:
+            # Лимит скорости расходуем только на реальные DNS запросы
+            await self.rate_limiter.wait_async()
+            try:
+                answers = await self.aresolver.resolve(domain, 'MX')
+            except dns.resolver.NoAnswer:
+                self._mx_cache_put(domain, [], self.MX_NEGATIVE_TTL)
+                self._persistent_cache_put(domain, [], self.MX_NEGATIVE_TTL)
+                mx_records = []
+            except dns.resolver.NXDOMAIN as e:
+                self._mx_cache_put(domain, e, self.MX_NEGATIVE_TTL)
+                self._persistent_cache_put(domain, e, self.MX_NEGATIVE_TTL)
+                raise
+            else:
+                mx_records = []
+                for rdata in answers:
+                    mx_records.append(str(rdata.exchange).rstrip('.'))
+
+                # TTL кеша не превышает TTL самой записи
+                ttl = min(answers.rrset.ttl, self.MX_CACHE_TTL)
+                self._mx_cache_put(domain, mx_records, ttl)
+                self._persistent_cache_put(domain, mx_records, ttl)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(mx_records)
+            return mx_records
+        finally:
+            del self._inflight[domain]
 
 
 class DatabaseManager:
@@ -225,113 +533,338 @@ class DatabaseManager:
             db_path: Путь к файлу базы данных
         """
         self.db_path = db_path
+        # Одно соединение на все время работы: повторные connect() дороги.
+        # check_same_thread=False + собственный замок: кеш DNS читается
+        # и пишется из рабочих потоков
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # WAL и synchronous=NORMAL: меньше fsync на каждую транзакцию
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
         self._init_database()
-    
+
     def _init_database(self):
         """Инициализирует структуру базы данных"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Создаем таблицу для результатов проверки
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS email_checks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    mx_records TEXT,
-                    error_message TEXT,
-                    check_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    rate_limit INTEGER
-                )
-            ''')
-            
-            # Создаем индекс для быстрого поиска по email
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_email ON email_checks(email)
-            ''')
-            
-            conn.commit()
-    
+        cursor = self._conn.cursor()
+
+        # Создаем таблицу для результатов проверки
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS email_checks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error_message TEXT,
+                check_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                rate_limit INTEGER
+            )
+        ''')
+
+        # MX записи нормализованы в дочернюю таблицу: по строке на хост,
+        # аналитические запросы используют индекс вместо разбора CSV
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS email_check_mx (
+                check_id INTEGER NOT NULL,
+                host TEXT NOT NULL,
+                FOREIGN KEY(check_id) REFERENCES email_checks(id)
+            )
+        ''')
+
+        # Создаем индекс для быстрого поиска по email
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_email ON email_checks(email)
+        ''')
+
+        # Индексы дочерней таблицы: поиск по хосту и выборка записей проверки
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_mx_host ON email_check_mx(host)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_mx_check ON email_check_mx(check_id)
+        ''')
+
+        # Персистентный кеш DNS результатов между запусками
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dns_cache (
+                domain TEXT PRIMARY KEY,
+                mx_records TEXT,
+                negative INTEGER NOT NULL DEFAULT 0,
+                expires_at REAL NOT NULL
+            )
+        ''')
+
+        self._conn.commit()
+
     def save_result(self, result: EmailResult, rate_limit: int):
         """
         Сохраняет результат проверки в базу данных
-        
+
         Args:
             result: Результат проверки email
             rate_limit: Используемое ограничение скорости
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Преобразуем список MX записей в строку
-            mx_records_str = ','.join(result.mx_records) if result.mx_records else None
-            
-            cursor.execute('''
-                INSERT INTO email_checks (email, status, mx_records, error_message, rate_limit)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                result.email,
-                result.status.value,
-                mx_records_str,
-                result.error,
-                rate_limit
-            ))
-            
-            conn.commit()
-    
+        self.save_results([result], rate_limit)
+
+    def save_results(self, results: List[EmailResult], rate_limit: int):
+        """
+        Сохраняет пачку результатов одной транзакцией
+
+        Строки email_checks и MX хосты в email_check_mx пишутся в одной
+        транзакции с единственным commit (и fsync) на всю пачку.
+
+        Args:
+            results: Результаты проверки email
+            rate_limit: Используемое ограничение скорости
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            for result in results:
+                cursor.execute('''
+                    INSERT INTO email_checks (email, status, error_message, rate_limit)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    result.email,
+                    result.status.value,
+                    result.error,
+                    rate_limit
+                ))
+
+                if result.mx_records:
+                    check_id = cursor.lastrowid
+                    cursor.executemany('''
+                        INSERT INTO email_check_mx (check_id, host)
+                        VALUES (?, ?)
+                    ''', [(check_id, host) for host in result.mx_records])
+
+            self._conn.commit()
+
     def get_summary(self) -> Dict[str, int]:
         """
         Возвращает сводку по результатам проверки
-        
+
         Returns:
             Словарь с количеством email по статусам
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT status, COUNT(*) as count 
-                FROM email_checks 
-                GROUP BY status
-            ''')
-            
-            return {row[0]: row[1] for row in cursor.fetchall()}
-
-
-def process_emails(emails: List[str], validator: EmailValidator) -> List[EmailResult]:
-    """Обрабатывает email адреса последовательно"""
-    results = []
+        cursor = self._conn.cursor()
+
+        cursor.execute('''
+            SELECT status, COUNT(*) as count
+            FROM email_checks
+            GROUP BY status
+        ''')
+
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def get_cached(self, domain: str):
+        """
+        Возвращает запись персистентного DNS кеша для домена
+
+        Returns:
+            Кортеж (MX записи, негативный ли результат, оставшийся TTL)
+            или None, если записи нет либо она просрочена
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('''
+                SELECT mx_records, negative, expires_at
+                FROM dns_cache
+                WHERE domain = ? AND expires_at > ?
+            ''', (domain, now)).fetchone()
+
+        if row is None:
+            return None
+
+        mx_records_str, negative, expires_at = row
+        mx_records = mx_records_str.split(',') if mx_records_str else []
+        return mx_records, bool(negative), expires_at - now
+
+    def put_cached(self, domain: str, mx_records: List[str], negative: bool, ttl: float):
+        """
+        Сохраняет результат DNS запроса в персистентный кеш
+
+        Args:
+            domain: Домен (нормализованный)
+            mx_records: MX записи (пустой список для негативных результатов)
+            negative: Признак негативного результата (NXDOMAIN)
+            ttl: Время жизни записи в секундах
+        """
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO dns_cache (domain, mx_records, negative, expires_at)
+                VALUES (?, ?, ?, ?)
+            ''', (domain, ','.join(mx_records), int(negative), time.time() + ttl))
+            self._conn.commit()
+
+    def close(self):
+        """Закрывает соединение с базой данных"""
+        self._conn.close()
+
+
+# Размер порции при потоковой записи результатов в SQLite
+SAVE_CHUNK_SIZE = 1000
+
+
+def process_emails(emails: List[str], validator: EmailValidator,
+                   db_manager: DatabaseManager = None) -> Optional[List[EmailResult]]:
+    """
+    Обрабатывает email адреса, группируя их по доменам
+
+    Все адреса сначала проходят синтаксическую проверку, затем каждый
+    уникальный домен резолвится ровно один раз (пулом потоков), а
+    результат раздается всем адресам этого домена. Объем DNS работы
+    пропорционален числу уникальных доменов, а не числу адресов.
+
+    Если передан db_manager, результаты пишутся в БД порциями по
+    SAVE_CHUNK_SIZE по мере готовности и не накапливаются в памяти;
+    функция в этом случае возвращает None.
+    """
     total = len(emails)
+    streaming = db_manager is not None
+    results: Optional[List[Optional[EmailResult]]] = None if streaming else [None] * total
+    pending: List[EmailResult] = []
     start_time = time.time()
-    
-    for i, email in enumerate(emails, 1):
-        try:
-            # Показываем прогресс с текущей скоростью
-            elapsed = time.time() - start_time
+    last_print = 0.0
+
+    def emit(index: int, result: EmailResult):
+        """Складывает результат в общий список или в буфер записи в БД"""
+        if streaming:
+            pending.append(result)
+            if len(pending) >= SAVE_CHUNK_SIZE:
+                db_manager.save_results(pending, validator.rate_limit)
+                pending.clear()
+        else:
+            results[index] = result
+
+    # Группируем адреса по домену; синтаксически невалидные
+    # получают результат сразу, без DNS
+    by_domain: Dict[str, List[int]] = {}
+    stripped = []
+    done_count = 0
+    for i, email in enumerate(emails):
+        email = email.strip()
+        stripped.append(email)
+        result, domain = validator._parse_email(email)
+        if result is not None:
+            emit(i, result)
+            done_count += 1
+        else:
+            by_domain.setdefault(domain, []).append(i)
+
+    # Домены резолвим пулом потоков: DNS запрос отпускает GIL на время
+    # ожидания сокета, так что потоки дают параллелизм без asyncio
+    domains = list(by_domain)
+    if validator.rate_limit > 0:
+        max_workers = max(8, validator.rate_limit // 4)
+    else:
+        max_workers = 32
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for domain, (status, mx_records, error) in zip(
+                    domains, executor.map(validator._check_domain, domains)):
+                for i in by_domain[domain]:
+                    emit(i, EmailResult(stripped[i], status,
+                                        mx_records=list(mx_records), error=error))
+
+                done_count += len(by_domain[domain])
+
+                # Показываем прогресс не чаще ~10 раз в секунду
+                now = time.time()
+                if now - last_print > 0.1 or done_count == total:
+                    last_print = now
+                    elapsed = now - start_time
+                    current_rate = validator.rate_limiter.get_current_rate()
+                    speed = done_count / elapsed if elapsed > 0 else 0
+
+                    print(f"Обработка {done_count}/{total} ({done_count/total*100:.1f}%) | "
+                          f"Скорость: {speed:.1f} email/сек | "
+                          f"Текущая нагрузка DNS: {current_rate:.0f}/{validator.rate_limit} запр/сек",
+                          end='\r')
+    except KeyboardInterrupt:
+        print("\n\nПрервано пользователем")
+        sys.exit(1)
+
+    print()  # Новая строка после прогресса
+
+    if streaming:
+        # Дописываем неполную последнюю порцию
+        if pending:
+            db_manager.save_results(pending, validator.rate_limit)
+        return None
+
+    return results
+
+
+async def process_emails_async(emails: List[str], validator: EmailValidator,
+                               concurrency: int = 50,
+                               db_manager: DatabaseManager = None) -> Optional[List[EmailResult]]:
+    """
+    Обрабатывает email адреса параллельно через asyncio
+
+    Одновременно выполняется не более `concurrency` проверок (семафор),
+    порядок результатов совпадает с порядком входных адресов.
+
+    Если передан db_manager, результаты пишутся в БД порциями по
+    SAVE_CHUNK_SIZE по мере готовности и не накапливаются в памяти;
+    функция в этом случае возвращает None.
+    """
+    total = len(emails)
+    streaming = db_manager is not None
+    pending: List[EmailResult] = []
+    start_time = time.time()
+    semaphore = asyncio.Semaphore(concurrency)
+    done_count = 0
+    last_print = 0.0
+
+    async def bounded(email: str) -> EmailResult:
+        nonlocal done_count, last_print
+        async with semaphore:
+            try:
+                result = await validator.check_email_async(email)
+            except Exception as e:
+                print(f"\nОшибка при обработке {email}: {str(e)}")
+                result = EmailResult(
+                    email,
+                    EmailStatus.UNKNOWN,
+                    error=f"Ошибка при обработке: {str(e)}"
+                )
+
+        done_count += 1
+
+        # Показываем прогресс не чаще ~10 раз в секунду
+        now = time.time()
+        if now - last_print > 0.1 or done_count == total:
+            last_print = now
+            elapsed = now - start_time
             current_rate = validator.rate_limiter.get_current_rate()
-            speed = i / elapsed if elapsed > 0 else 0
-            
-            print(f"Обработка {i}/{total} ({i/total*100:.1f}%) | "
+            speed = done_count / elapsed if elapsed > 0 else 0
+
+            print(f"Обработка {done_count}/{total} ({done_count/total*100:.1f}%) | "
                   f"Скорость: {speed:.1f} email/сек | "
-                  f"Текущая нагрузка DNS: {current_rate:.0f}/{validator.rate_limit} запр/сек", 
+                  f"Текущая нагрузка DNS: {current_rate:.0f}/{validator.rate_limit} запр/сек",
                   end='\r')
-            
-            # Проверяем email
-            result = validator.check_email(email)
-            results.append(result)
-            
-        except KeyboardInterrupt:
-            print("\n\nПрервано пользователем")
-            sys.exit(1)
-        except Exception as e:
-            print(f"\nОшибка при обработке {email}: {str(e)}")
-            results.append(EmailResult(
-                email, 
-                EmailStatus.UNKNOWN, 
-                error=f"Ошибка при обработке: {str(e)}"
-            ))
-    
+
+        if streaming:
+            # Цикл событий однопоточный, а save_results не содержит await,
+            # так что буфер не требует дополнительной синхронизации
+            pending.append(result)
+            if len(pending) >= SAVE_CHUNK_SIZE:
+                db_manager.save_results(pending, validator.rate_limit)
+                pending.clear()
+            return None
+
+        return result
+
+    results = list(await asyncio.gather(*(bounded(email) for email in emails)))
+
     print()  # Новая строка после прогресса
+
+    if streaming:
+        # Дописываем неполную последнюю порцию
+        if pending:
+            db_manager.save_results(pending, validator.rate_limit)
+        return None
+
     return results
 
 
@@ -394,6 +927,8 @@ def main():
     parser.add_argument('--db', help='Файл SQLite базы данных для сохранения результатов')
     parser.add_argument('--rate-limit', type=int, default=50,
                        help='Максимальное число DNS запросов в секунду (0 = без ограничений, по умолчанию: 50)')
+    parser.add_argument('--threads', action='store_true',
+                       help='Использовать пул потоков вместо asyncio')
     
     args = parser.parse_args()
     
@@ -405,50 +940,74 @@ def main():
     # Проверяем существование файла
     try:
         with open(args.file, 'r', encoding='utf-8') as f:
-            emails = [line.strip() for line in f if line.strip()]
+            # Читаем потоково, без промежуточного списка всех строк,
+            # и убираем дубликаты с сохранением порядка (dict как ordered set)
+            raw_count = 0
+            unique = {}
+            for line in f:
+                email = line.strip()
+                if email:
+                    raw_count += 1
+                    unique[email] = None
+            emails = list(unique)
     except FileNotFoundError:
         print(f"Ошибка: Файл '{args.file}' не найден")
         sys.exit(1)
     except Exception as e:
         print(f"Ошибка при чтении файла: {str(e)}")
         sys.exit(1)
-    
+
     if not emails:
         print("Файл не содержит email адресов")
         sys.exit(0)
-    
+
     print(f"Найдено {len(emails)} email адресов для проверки")
+    if raw_count > len(emails):
+        print(f"Пропущено дубликатов: {raw_count - len(emails)}")
     if args.rate_limit == 0:
         print("Режим: без ограничений скорости DNS запросов")
     else:
         print(f"Ограничение скорости: {args.rate_limit} DNS запросов в секунду")
     
-    # Создаем валидатор с указанным ограничением
-    validator = EmailValidator(rate_limit=args.rate_limit)
+    # Создаем валидатор с указанным ограничением; при сохранении в БД
+    # валидатор переиспользует ее персистентный DNS кеш
+    db_manager = DatabaseManager(args.db) if args.db else None
+    validator = EmailValidator(rate_limit=args.rate_limit, db_manager=db_manager)
     
     # Обрабатываем email адреса
     start_time = datetime.now()
     print("\nНачинаем проверку...")
     
-    results = process_emails(emails, validator)
+    # При сохранении в БД результаты уходят туда порциями по мере
+    # проверки и не накапливаются в памяти
+    if args.threads:
+        # Пул потоков: DNS I/O отпускает GIL, asyncio не требуется
+        results = process_emails(emails, validator, db_manager=db_manager)
+    else:
+        # Параллельная проверка: число одновременных запросов привязываем к лимиту
+        concurrency = args.rate_limit if args.rate_limit > 0 else 50
+        try:
+            results = asyncio.run(process_emails_async(emails, validator,
+                                                       concurrency=concurrency,
+                                                       db_manager=db_manager))
+        except KeyboardInterrupt:
+            print("\n\nПрервано пользователем")
+            sys.exit(1)
     
     end_time = datetime.now()
     processing_time = (end_time - start_time).total_seconds()
     
-    # Сохраняем или выводим результаты
+    # Выводим сводку или результаты
     if args.db:
-        print(f"\nСохранение результатов в базу данных: {args.db}")
-        db_manager = DatabaseManager(args.db)
-        
-        for result in results:
-            db_manager.save_result(result, args.rate_limit)
-        
+        print(f"\nРезультаты сохранены в базу данных: {args.db}")
+
         # Выводим сводку
         summary = db_manager.get_summary()
-        print("\nСохранено в базу данных. Сводка:")
+        print("\nСводка:")
         for status, count in sorted(summary.items()):
             print(f"  {status}: {count}")
         print(f"Всего: {sum(summary.values())}")
+        db_manager.close()
     else:
         # Выводим результаты в консоль
         print_results(results, args.rate_limit)